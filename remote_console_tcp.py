@@ -13,34 +13,47 @@ Website: www.esun21.com
 
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, ttk
-import serial
-import serial.tools.list_ports
+import tkinter.font as tkFont
 import threading
+import collections
 import socketserver
+import selectors
+import select
 import subprocess
 import configparser
+import functools
+import re
 import os
 import sys
 import socket
 import time
 import tempfile
+import io
+from concurrent.futures import ThreadPoolExecutor
 
 
 # --- Resource path handling ---
 # Used for correctly accessing resource files (e.g., frpc.exe, logo256.ico) after PyInstaller packaging
+# If running as PyInstaller bundle, sys._MEIPASS points to temp resource dir;
+# otherwise use current working directory. Resolved once, it never changes at runtime.
+_BASE_PATH = getattr(sys, '_MEIPASS', None) or os.path.abspath(".")
+
+# Directory of the executable (bundle) or script (source), where an external config.ini lives
+if getattr(sys, 'frozen', False):
+    # Running as PyInstaller bundle
+    _EXE_DIR = os.path.dirname(sys.executable)
+else:
+    # Running from source
+    _EXE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
 def resource_path(relative_path):
     """
     Get absolute path to resource.
     In PyInstaller bundled app, resources are unpacked to _MEIPASS;
     during development, use current working directory.
     """
-    try:
-        # If running as PyInstaller bundle, sys._MEIPASS points to temp resource dir
-        base_path = sys._MEIPASS
-    except Exception:
-        # Otherwise use script's directory
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
 
 
 # --- Application metadata ---
@@ -50,6 +63,7 @@ UPDATE_NOTES = [
     "• Added: External config.ini support",
     "• Improved: UI details and messages",
 ]
+_ABOUT_NOTES = "\n".join(UPDATE_NOTES)  # As shown in the About dialog
 
 
 # FRPC_EXEC points to the bundled frpc.exe (internal resource)
@@ -64,6 +78,22 @@ DEFAULT_FRP_CONFIG = {
 }
 
 
+# --- Parse config.ini (cached per file version) ---
+@functools.lru_cache(maxsize=4)
+def _parse_frp_config(config_path, mtime_ns, size):
+    """
+    Parse config.ini and return (addr, port, token).
+    mtime_ns and size are only part of the cache key, so an edited file is re-read.
+    """
+    cfg = configparser.ConfigParser()
+    # Use UTF-8 encoding to avoid issues from manual edits
+    cfg.read(config_path, encoding='utf-8')
+    frps_addr = cfg.get("frp_server", "frps_addr", fallback=DEFAULT_FRP_CONFIG["addr"])
+    frps_port = cfg.getint("frp_server", "frps_port", fallback=DEFAULT_FRP_CONFIG["port"])
+    frps_token = cfg.get("frp_server", "frps_token", fallback=DEFAULT_FRP_CONFIG["token"])
+    return frps_addr, frps_port, frps_token
+
+
 # --- Securely load config.ini: read-only, never create ---
 def load_frp_config():
     """
@@ -72,33 +102,19 @@ def load_frp_config():
     Note: This function only reads existing files; it never creates config.ini.
     Returns: (addr, port, token)
     """
-    # 1. Get the root directory where the executable resides
-    if getattr(sys, 'frozen', False):
-        # Running as PyInstaller bundle
-        base_dir = os.path.dirname(sys.executable)
-    else:
-        # Running from source
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-
-    # 2. Define external config path (same level as .exe)
-    external_config = os.path.join(base_dir, "config.ini")
-
-    # 3. Priority: external first, then default
-    if os.path.exists(external_config):
-        config_path = external_config
-    else:
+    # 1. Define external config path (same level as .exe)
+    external_config = os.path.join(_EXE_DIR, "config.ini")
+
+    # 2. Priority: external first, then default
+    try:
+        st = os.stat(external_config)
+    except OSError:
         # No config found → return defaults
         return DEFAULT_FRP_CONFIG["addr"], DEFAULT_FRP_CONFIG["port"], DEFAULT_FRP_CONFIG["token"]
 
-    # 4. Attempt to read config
-    cfg = configparser.ConfigParser()
+    # 3. Attempt to read config (reuses the cached result while the file is unchanged)
     try:
-        # Use UTF-8 encoding to avoid issues from manual edits
-        cfg.read(config_path, encoding='utf-8')
-        frps_addr = cfg.get("frp_server", "frps_addr", fallback=DEFAULT_FRP_CONFIG["addr"])
-        frps_port = cfg.getint("frp_server", "frps_port", fallback=DEFAULT_FRP_CONFIG["port"])
-        frps_token = cfg.get("frp_server", "frps_token", fallback=DEFAULT_FRP_CONFIG["token"])
-        return frps_addr, frps_port, frps_token
+        return _parse_frp_config(external_config, st.st_mtime_ns, st.st_size)
     except Exception:
         # On parse error, fall back to defaults
         return DEFAULT_FRP_CONFIG["addr"], DEFAULT_FRP_CONFIG["port"], DEFAULT_FRP_CONFIG["token"]
@@ -108,43 +124,199 @@ def load_frp_config():
 SERVER_ADDR, SERVER_PORT, SERVER_TOKEN = load_frp_config()
 
 
+def _parse_port(text):
+    """Return text as an int if it is a valid TCP port (1-65535), else None"""
+    try:
+        port = int(text)
+    except ValueError:
+        return None
+    return port if 1 <= port <= 65535 else None
+
+
+# frpc output line reporting that the remote port is already taken on the server
+# (matched against the raw bytes of each line)
+_PROXY_EXISTS_RE = re.compile(rb"start error: proxy \[[^\]]+\] already exists")
+
+
+def _wait_process(process, timeout):
+    """
+    Wait up to timeout seconds for process to exit and reap it; returns True if it exited.
+    On Linux the wait sleeps on a pidfd until the kernel reports the exit, instead of
+    Popen.wait's sleep-and-poll loop; elsewhere Popen.wait is used (event-driven on Windows).
+    """
+    if hasattr(os, 'pidfd_open') and process.returncode is None:
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            pidfd = None  # Already reaped, or kernel without pidfd support
+        if pidfd is not None:
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                poller.poll(timeout * 1000)
+            finally:
+                os.close(pidfd)
+            timeout = 0  # Exited (or out of time): only reap below
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False
+    return True
+
+
+# Hidden-console STARTUPINFO for frpc (Windows). Popen copies it before use, so one
+# instance can be shared by every launch
+_WIN_STARTUPINFO = None
+
+
+def _hidden_window_startupinfo():
+    """STARTUPINFO that hides frpc's console window on Windows (built once, reused); None elsewhere"""
+    global _WIN_STARTUPINFO
+    if os.name != 'nt':
+        return None
+    if _WIN_STARTUPINFO is None:
+        si = subprocess.STARTUPINFO()
+        si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        si.wShowWindow = subprocess.SW_HIDE
+        _WIN_STARTUPINFO = si
+    return _WIN_STARTUPINFO
+
+
+# --- Temporary frpc config ---
+# Same layout ConfigParser.write() would produce.
+# The server section is identical for every proxy, so it is rendered (and encoded) once
+_COMMON_INI = (
+    "[common]\n"
+    f"server_addr = {SERVER_ADDR}\n"
+    f"server_port = {SERVER_PORT}\n"
+    "authentication_method = token\n"
+    f"token = {SERVER_TOKEN}\n"
+    "\n"
+).encode('utf-8')
+
+FRPC_PROXY_TMPL = (
+    "[proxy_{rp}]\n"
+    "type = tcp\n"
+    "local_ip = {lip}\n"
+    "local_port = {lp}\n"
+    "remote_port = {rp}\n"
+    "\n"
+)
+
+
+def _emit_frpc_ini(local_ip, local_port, remote_port):
+    """
+    Write a temporary frpc config for one proxy and return its path.
+    The file is deleted by the GUI when the connection is removed or the app closes.
+    """
+    data = _COMMON_INI + FRPC_PROXY_TMPL.format(lip=local_ip, lp=local_port, rp=remote_port).encode('utf-8')
+    # Raw fd: the whole file goes out in one write, without a file object or text layer
+    fd, path = tempfile.mkstemp(prefix=f"frpc_{remote_port}_", suffix=".ini")
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    return path
+
+
 # ---------------- Serial-to-TCP Bridge ----------------
+class BridgeTCPServer(socketserver.TCPServer):
+    """
+    TCP server used by SerialBridge.
+    Client sessions run on a bounded thread pool instead of a new thread per connection.
+    Options are class attributes because they are consumed while the constructor binds and listens.
+    """
+    # Allow quick rebind after a bridge restart (POSIX only: on Windows SO_REUSEADDR lets a
+    # second bridge bind a port that is still listening, instead of failing)
+    allow_reuse_address = os.name != 'nt'
+    request_queue_size = 32     # Listen backlog
+    max_workers = 16            # Concurrent client sessions
+    socket_buffer_size = 262144  # SO_SNDBUF/SO_RCVBUF of the listener, inherited by accepted clients
+
+    def __init__(self, server_address, handler_class):
+        # Created first: a failed bind calls server_close() from inside the base constructor
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bridge")
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self):
+        """Size the socket buffers before bind/listen, so the TCP window is negotiated with them"""
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+        super().server_bind()
+
+    def process_request(self, request, client_address):
+        """Hand the accepted connection to the pool"""
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        """Same as socketserver.ThreadingMixIn: handle, report errors, always close"""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        """Close the listening socket and release the pool threads once idle"""
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
 class SerialBridge:
     """
     Implements bidirectional bridge between serial port and TCP.
     Uses socketserver to create a TCP server that forwards data between serial and TCP clients.
     """
 
+    FLUSH_SIZE = 16384   # Send serial → TCP batch once it reaches this many bytes
+    FLUSH_DELAY = 0.001  # ...or once its oldest byte has waited this long (seconds)
+    SEND_BUFFER_SIZE = 65536  # Unsent serial → TCP bytes held before serial reads pause
+    # Client keepalive: first probe after 30s idle, then every 10s, give up after 3 misses
+    KEEPALIVE_OPTIONS = (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+
     def __init__(self, serial_port, baudrate, local_port, log_func):
         self.serial_port = serial_port  # e.g., "COM3"
         self.baudrate = baudrate        # Baud rate
         self.local_port = local_port    # Local TCP port to listen on (for FRP)
         self.log = log_func             # Logging callback
         self.ser = None                 # serial.Serial object
+        self.ser_fd = None              # Raw serial fd (POSIX only; None on Windows)
         self.server = None              # socketserver.TCPServer object
         self.thread = None              # Server thread
         self.running = False            # Running flag
+        self.verbose = False            # Log forwarded byte counts (rate-limited)
+        self.port_lock = threading.Lock()  # Held while closing/reopening ser and while a session copies ser_fd
 
     def start(self):
         """Start the serial bridge"""
+        import serial  # Imported on first use to keep GUI startup fast
+
         try:
             # Open serial port
+            # No inter-byte timeout: it held every read open for 50ms after the first byte
             self.ser = serial.Serial(
                 self.serial_port,
                 self.baudrate,
-                timeout=0.1,            # Read timeout
+                timeout=0.5,            # Read timeout (threaded pump only; cancel_read() ends it early)
                 write_timeout=1.0,      # Write timeout
-                inter_byte_timeout=0.05 # Inter-byte timeout
             )
         except Exception as e:
             self.log(f"[ERROR] Failed to open serial port {self.serial_port}: {e}")
             return False
 
+        self._prepare_port()
+
         # Dynamically create TCP request handler (closure captures ser and log)
         handler = self.make_handler()
-        # Create multi-threaded TCP server (listen on all interfaces)
-        self.server = socketserver.ThreadingTCPServer(('0.0.0.0', self.local_port), handler)
-        self.server.allow_reuse_address = True  # Allow port reuse
+        # Create pooled TCP server (listen on all interfaces)
+        try:
+            self.server = BridgeTCPServer(('0.0.0.0', self.local_port), handler)
+        except OSError as e:
+            # e.g. another mapping's bridge already listens on this local port
+            self.log(f"[ERROR] Failed to listen on local port {self.local_port}: {e}")
+            self.ser.close()
+            return False
 
         # Start server thread
         self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
@@ -153,28 +325,77 @@ class SerialBridge:
         self.log(f"[INFO] Serial bridge started: {self.serial_port}@{self.baudrate} → TCP {self.local_port}")
         return True
 
-    def stop(self):
-        """Stop the serial bridge"""
+    def _prepare_port(self):
+        """Set up the freshly opened serial port for forwarding"""
+        # POSIX serial ports expose a file descriptor that can be read directly and
+        # multiplexed with the socket; Windows COM handles cannot
+        try:
+            self.ser_fd = self.ser.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            self.ser_fd = None
+
+        # Windows: enlarge the driver's receive queue so bursts are not overrun while
+        # the TCP side catches up (only the Windows backend has set_buffer_size)
+        if hasattr(self.ser, 'set_buffer_size'):
+            try:
+                self.ser.set_buffer_size(rx_size=262144, tx_size=65536)
+            except Exception as e:
+                self.log(f"[WARN] Could not enlarge serial buffers on {self.serial_port}: {e}")
+
+    def pause(self):
+        """
+        Close the serial port but keep the TCP listener bound, so resume() can reuse it.
+        Active sessions end as soon as they notice the closed port.
+        """
         if not self.running:
             return
+        with self.port_lock:
+            self.running = False
+            try:
+                if self.ser and self.ser.is_open:
+                    self.ser.close()
+            except Exception as e:
+                self.log(f"[WARN] Error closing serial port: {e}")
+        self.log(f"[INFO] Serial bridge paused: {self.serial_port}")
+
+    def resume(self):
+        """Reopen the serial port of a paused bridge; returns False if it cannot be opened"""
+        if self.running:
+            return True
+        with self.port_lock:
+            try:
+                self.ser.open()
+            except Exception as e:
+                self.log(f"[ERROR] Failed to open serial port {self.serial_port}: {e}")
+                return False
+            self._prepare_port()
+            self.running = True
+        self.log(f"[INFO] Serial bridge resumed: {self.serial_port}@{self.baudrate} → TCP {self.local_port}")
+        return True
+
+    def stop(self):
+        """Stop the serial bridge (running or paused)"""
+        if self.server is None:
+            return
 
-        self.running = False
         self.log(f"[INFO] Stopping serial bridge: {self.serial_port}")
 
         # Safely close serial port
-        try:
-            if self.ser and self.ser.is_open:
-                self.ser.close()
-        except Exception as e:
-            self.log(f"[WARN] Error closing serial port: {e}")
+        with self.port_lock:
+            self.running = False
+            try:
+                if self.ser and self.ser.is_open:
+                    self.ser.close()
+            except Exception as e:
+                self.log(f"[WARN] Error closing serial port: {e}")
 
         # Shut down TCP server
         try:
-            if self.server:
-                self.server.shutdown()      # Stop serve_forever
-                self.server.server_close()  # Close socket
+            self.server.shutdown()      # Stop serve_forever
+            self.server.server_close()  # Close socket
         except Exception as e:
             self.log(f"[WARN] Error during server shutdown: {e}")
+        self.server = None
 
         # Wait for thread to finish (max 2 seconds)
         if self.thread and self.thread.is_alive():
@@ -186,83 +407,261 @@ class SerialBridge:
         """
         Return a dynamically generated TCP request handler class.
         Uses closure to capture current instance's ser and log.
+        (ser is reopened in place by resume(); its fd is read from the bridge per session.)
         """
+        import serial
+
+        bridge = self
         ser = self.ser
         log = self.log
 
         class Handler(socketserver.BaseRequestHandler):
             """Handle each TCP client connection"""
 
+            def setup(self):
+                """Tune the accepted socket before forwarding starts"""
+                # Disable Nagle so single keystrokes are not held back waiting for ACKs
+                # (buffer sizes are inherited from the listening socket)
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                # Keepalive: a client that vanished without closing (dropped tunnel) is detected
+                # after about a minute instead of the OS default of ~2 hours, freeing its session
+                self.request.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                for name, value in bridge.KEEPALIVE_OPTIONS:
+                    if hasattr(socket, name):  # Not every platform exposes every option
+                        try:
+                            self.request.setsockopt(socket.IPPROTO_TCP, getattr(socket, name), value)
+                        except OSError:
+                            pass
+                self.bytes_s2t = 0      # Bytes forwarded serial → TCP
+                self.bytes_t2s = 0      # Bytes forwarded TCP → serial
+                self.last_trace = 0.0   # Monotonic time of last verbose trace
+                super().setup()
+
             def handle(self):
-                self.request.settimeout(0.5)  # Set socket timeout
                 client_addr = self.client_address
+                if not bridge.running:
+                    # Listener kept bound while paused; there is no serial port to talk to
+                    log(f"[WARN] Rejected client {client_addr}: serial bridge is paused")
+                    return
                 log(f"[INFO] New client connected: {client_addr}")
 
-                stop_event = threading.Event()  # Coordinate thread exit
+                # Without a selectable serial fd (Windows), fall back to one thread per direction
+                if bridge.ser_fd is None:
+                    self.pump_threads()
+                else:
+                    self.pump_selector()
+
+                log(f"[INFO] Session ended for client {client_addr} "
+                    f"(serial → TCP {self.bytes_s2t}B, TCP → serial {self.bytes_t2s}B)")
+
+            def trace(self):
+                """Log forwarded byte counts, at most every 0.25s (verbose mode only)"""
+                now = time.monotonic()
+                if now - self.last_trace >= 0.25:
+                    self.last_trace = now
+                    log(f"[TRACE] {self.client_address} serial → TCP {self.bytes_s2t}B, "
+                        f"TCP → serial {self.bytes_t2s}B")
+
+            def pump_selector(self):
+                """
+                Forward both directions from a single thread using a selector.
+                The socket is non-blocking: serial data the client cannot take yet stays in a
+                bounded buffer, and while that buffer is full the serial fd is not read, so a
+                stalled client applies backpressure instead of blocking TCP → serial.
+                The session works on its own duplicate of the serial fd: pause()/stop() close
+                the port from another thread, and the kernel may hand the freed fd number to an
+                unrelated file while this loop would still read and poll it.
+                """
+                client_addr = self.client_address
+                sock = self.request
+                sock.setblocking(False)
+                sel = selectors.DefaultSelector()
+                # Reusable buffers: nothing is allocated per forwarded chunk
+                recv_buf = bytearray(4096)                  # TCP → serial
+                recv_view = memoryview(recv_buf)
+                out_view = memoryview(bytearray(bridge.SEND_BUFFER_SIZE))  # Serial → TCP, unsent
+                pending = 0            # Bytes at the start of out_view waiting to be sent
+                flush_at = None        # Monotonic deadline for flushing a partial batch
+                sending = False        # Unsent data remains; waiting for the socket to be writable
+                serial_paused = False  # Serial fd unregistered because out_view is full
+                with bridge.port_lock:
+                    if not bridge.running:
+                        sel.close()
+                        return  # Paused since handle() checked
+                    ser_fd = os.dup(bridge.ser_fd)
+                try:
+                    sel.register(sock, selectors.EVENT_READ)
+                    sel.register(ser_fd, selectors.EVENT_READ)
+                    # Idle timeout only serves to notice the bridge being stopped
+                    while bridge.running and ser.is_open:
+                        if flush_at is None or sending:
+                            timeout = 0.5
+                        else:
+                            timeout = max(0.0, flush_at - time.monotonic())
+                        writable = False
+                        for key, events in sel.select(timeout=timeout):
+                            if key.fileobj is sock:
+                                if events & selectors.EVENT_WRITE:
+                                    writable = True
+                                if not events & selectors.EVENT_READ:
+                                    continue
+                                # TCP → serial
+                                try:
+                                    n = sock.recv_into(recv_buf)
+                                except BlockingIOError:
+                                    continue
+                                except (ConnectionResetError, BrokenPipeError, OSError) as e:
+                                    log(f"[WARN] Client {client_addr} disconnected: {e}")
+                                    return
+                                if not n:
+                                    log(f"[INFO] Client {client_addr} closed connection normally")
+                                    return
+                                try:
+                                    ser.write(recv_view[:n])
+                                except serial.SerialException as e:
+                                    log(f"[ERROR] Serial write failed: {e}")
+                                    return
+                                self.bytes_t2s += n
+                                if bridge.verbose:
+                                    self.trace()
+                            else:
+                                # Serial → TCP: read the fd directly (pyserial opens it non-blocking)
+                                # into the free tail of the send buffer
+                                try:
+                                    n = os.readv(ser_fd, [out_view[pending:]])
+                                except BlockingIOError:
+                                    continue
+                                if not n:
+                                    # Readable but empty: device disconnected or port closed
+                                    log(f"[ERROR] Serial port {bridge.serial_port} returned no data, closing session")
+                                    return
+                                if not pending:
+                                    flush_at = time.monotonic() + bridge.FLUSH_DELAY
+                                pending += n
+
+                        # Send once the batch is full or has aged out, or as soon as the
+                        # socket can take more after a partial send
+                        if pending and (writable if sending else
+                                        pending >= bridge.FLUSH_SIZE or time.monotonic() >= flush_at):
+                            try:
+                                sent = sock.send(out_view[:pending])
+                            except BlockingIOError:
+                                sent = 0
+                            except (ConnectionResetError, BrokenPipeError, OSError) as e:
+                                log(f"[WARN] Client {client_addr} disconnected (serial→TCP): {e}")
+                                return
+                            if sent:
+                                out_view[:pending - sent] = out_view[sent:pending]
+                                pending -= sent
+                                self.bytes_s2t += sent
+                                if bridge.verbose:
+                                    self.trace()
+                            flush_at = None
+                            if pending and not sending:
+                                sel.modify(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+                                sending = True
+                            elif not pending and sending:
+                                sel.modify(sock, selectors.EVENT_READ)
+                                sending = False
+
+                        # Backpressure: stop reading serial while the send buffer is full
+                        if pending == len(out_view):
+                            if not serial_paused:
+                                sel.unregister(ser_fd)
+                                serial_paused = True
+                        elif serial_paused:
+                            sel.register(ser_fd, selectors.EVENT_READ)
+                            serial_paused = False
+                except Exception as e:
+                    log(f"[ERROR] Bridge exception for client {client_addr}: {e}")
+                finally:
+                    sel.close()
+                    os.close(ser_fd)
+
+            def pump_threads(self):
+                """
+                Forward each direction on its own thread (serial ports without a selectable fd).
+                Serial → TCP runs on the handler thread, TCP → serial on a helper thread.
+                Whichever side ends first wakes the other: shutting the socket down makes
+                recv() return immediately and cancel_read() aborts a pending serial read.
+                """
+                client_addr = self.client_address
+                sock = self.request
+                self.session_over = False
+
+                def end_session():
+                    """Mark the session finished and unblock the opposite direction"""
+                    self.session_over = True
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+                    try:
+                        ser.cancel_read()
+                    except Exception:
+                        pass
 
                 def serial_to_tcp():
                     """Forward data from serial → TCP"""
                     try:
-                        while not stop_event.is_set():
-                            data = ser.read(1024)  # Read from serial
+                        while not self.session_over:
+                            # Wait for the first byte, then drain everything that arrived with it,
+                            # so a burst goes out as one send instead of a 1-byte send plus the rest
+                            data = ser.read(1)
                             if data:
+                                waiting = ser.in_waiting
+                                if waiting:
+                                    data += ser.read(waiting)
                                 try:
-                                    self.request.sendall(data)  # Send to TCP client
-                                    # Try to decode for logging (ignore undecodable bytes)
-                                    decoded = data.decode('utf-8', errors='replace')
-                                    for line in decoded.splitlines(keepends=True):
-                                        log(f"[SERIAL → TCP] {line.rstrip()}")
+                                    sock.sendall(data)  # Send to TCP client
+                                    self.bytes_s2t += len(data)
+                                    if bridge.verbose:
+                                        self.trace()
                                 except (ConnectionResetError, BrokenPipeError, OSError) as e:
-                                    log(f"[WARN] Client {client_addr} disconnected (serial→TCP): {e}")
+                                    if not self.session_over:
+                                        log(f"[WARN] Client {client_addr} disconnected (serial→TCP): {e}")
                                     break
                     except Exception as e:
-                        log(f"[ERROR] Serial read exception: {e}")
+                        # Reads fail once stop() closes the port; only report unexpected errors
+                        if bridge.running and not self.session_over:
+                            log(f"[ERROR] Serial read exception: {e}")
                     finally:
-                        stop_event.set()
+                        end_session()
 
                 def tcp_to_serial():
                     """Forward data from TCP → serial"""
+                    # Receive no more than the line sends in about half the 1s write timeout
+                    # (~10 bits per byte), so each ser.write() finishes well before it expires
+                    chunk_size = min(65536, max(64, bridge.baudrate // 20))
                     try:
-                        while not stop_event.is_set():
+                        while True:
                             try:
-                                data = self.request.recv(1024)  # Receive from TCP client
-                                if not data:
-                                    log(f"[INFO] Client {client_addr} closed connection normally")
-                                    break
-                                try:
-                                    ser.write(data)  # Write to serial
-                                    decoded = data.decode('utf-8', errors='replace')
-                                    for line in decoded.splitlines(keepends=True):
-                                        log(f"[TCP → SERIAL] {line.rstrip()}")
-                                except serial.SerialException as e:
-                                    log(f"[ERROR] Serial write failed: {e}")
-                                    break
-                            except socket.timeout:
-                                continue  # Timeout → continue loop
+                                data = sock.recv(chunk_size)  # Receive from TCP client
                             except (ConnectionResetError, BrokenPipeError, OSError) as e:
-                                log(f"[WARN] Client {client_addr} disconnected: {e}")
+                                if not self.session_over:
+                                    log(f"[WARN] Client {client_addr} disconnected: {e}")
+                                break
+                            if not data:
+                                if not self.session_over:
+                                    log(f"[INFO] Client {client_addr} closed connection normally")
+                                break
+                            try:
+                                ser.write(data)  # Write to serial
+                                self.bytes_t2s += len(data)
+                                if bridge.verbose:
+                                    self.trace()
+                            except serial.SerialException as e:
+                                log(f"[ERROR] Serial write failed: {e}")
                                 break
                     except Exception as e:
                         log(f"[ERROR] TCP receive exception: {e}")
                     finally:
-                        stop_event.set()
+                        end_session()
 
-                # Start both direction threads
-                t1 = threading.Thread(target=serial_to_tcp, daemon=True)
-                t2 = threading.Thread(target=tcp_to_serial, daemon=True)
-                t1.start()
-                t2.start()
-
-                # Wait until either thread ends
-                try:
-                    while t1.is_alive() or t2.is_alive():
-                        t1.join(timeout=0.1)
-                        t2.join(timeout=0.1)
-                except KeyboardInterrupt:
-                    pass
-
-                stop_event.set()
-                log(f"[INFO] Session ended for client {client_addr}")
+                t = threading.Thread(target=tcp_to_serial, daemon=True)
+                t.start()
+                serial_to_tcp()
+                t.join()
 
         return Handler
 
@@ -284,26 +683,60 @@ class FRPConnection:
         self.process = None               # subprocess.Popen object
         self.status = "Stopped"           # "Stopped" / "Running"
         self.frame = None                 # UI Frame reference (frame, prefix_lbl, status_lbl)
+        self.shown_status = None          # Status last rendered by refresh_status
+        self.status_var = None            # StringVar shown by the status label ("[Running]" etc.)
+        self.toggle_var = None            # StringVar shown by the Start/Stop button
         self.buttons = {}                 # UI button references
         self.bridge = None                # SerialBridge instance (serial only)
-        self.process_lock = threading.Lock()  # Protect process access
+        self.process_lock = threading.Lock()  # Serialises stopping (wait + clear process) and releasing the bridge
         self.is_temp_ini = True           # Mark if ini is temporary (for cleanup)
+        self.retired = False              # Removed / app closing: release bridge and ini once stopped
         self.baudrate = None              # Baud rate (serial only)
+        self.output_tail = b""            # Incomplete last line of frpc output
 
 
 # ---------------- Main GUI Window ----------------
 class FRPGUI:
     """Main GUI window class"""
 
+    LOG_MAX_LINES = 2500   # Trim the log widget once it grows past this...
+    LOG_KEEP_LINES = 2000  # ...down to the most recent lines
+    LOG_FLUSH_MS = 33      # Log flush interval (~30Hz)
+
     def __init__(self, root):
         self.root = root
         self.root.title("Remote Serial & TCP Slave")
         self.root.geometry("400x600")
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)  # Bind close event
 
-        self.connections = []   # Store all FRPConnection instances
+        # All FRPConnection instances, in creation order. A dict used as an ordered set
+        # (values unused): O(1) membership and removal
+        self.connections = {}
+        # Pending log lines, appended from any thread. Bounded like the widget itself, so a
+        # burst between flushes drops its oldest lines instead of growing without limit
+        self.log_queue = collections.deque(maxlen=self.LOG_KEEP_LINES)
+        self.log_drain_scheduled = False  # A _drain_log call is pending
+        self.log_lines = 0  # Lines currently in the log widget (counted, not queried)
+        self.ports_cache = (float('-inf'), [])  # (monotonic scan time, device list) of last port scan
+        self.ports_scan = None  # Background port scan thread, while one is running
+        self.output_selector = None  # Watches every frpc stdout pipe (POSIX; created on first start)
         self.closing = False    # Closing flag
-        self.close_start_time = None  # Time when closing started (for timeout)
+        self.close_finished = False   # Window teardown already done (normal or forced)
+        self.close_timeout_id = None  # after() id of the forced-exit timeout
+        self.pending_stops = set()    # Connections still stopping during close
+        self.stop_lock = threading.Lock()  # Protects closing/pending_stops across stop threads
+        self.stop_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stop")  # Runs _reap
+        self.frpc_exec_verified = False  # FRPC_EXEC found on disk; re-checked after a failed launch
+        self.scrollregion_pending = False  # A scroll region update is queued for the next idle turn
+        self.pending_destroy = []  # Hidden connection rows awaiting _flush_destroys
+        self.remote_port_inputs = None  # (IP, local port) the TCP public port was last suggested for
+        self.pending_refresh = set()  # Connections whose status row awaits _flush_refresh
+        self.refresh_lock = threading.Lock()  # Protects pending_refresh across worker threads
+
+        # Fonts for the clickable "[Running]" labels, shared by every connection row
+        self.status_font = tkFont.nametofont("TkDefaultFont")
+        self.status_font_underline = self.status_font.copy()
+        self.status_font_underline.configure(underline=True)
 
         # ====== Top: Notebook + "About" Button ======
         top_bar = tk.Frame(root)
@@ -356,7 +789,7 @@ class FRPGUI:
         # Bind scroll region update
         self.scrollable_conn_frame.bind(
             "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            lambda e: self._request_scrollregion_update()
         )
 
         # Embed scrollable frame into canvas
@@ -366,14 +799,17 @@ class FRPGUI:
         self.scrollbar.pack(side="right", fill="y")
         self.conn_container = self.scrollable_conn_frame
 
-        # Bind mouse wheel (Windows)
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        # Bind mouse wheel (Windows), only while the pointer is over the connection list,
+        # so wheel events elsewhere (e.g. the log) do not call into Python
+        self.canvas.bind("<Enter>", self._bind_mousewheel)
+        self.canvas.bind("<Leave>", self._unbind_mousewheel)
 
         # ====== Log Area ======
         log_frame = tk.Frame(root)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=5, padx=10)
         tk.Label(log_frame, text="Log:").pack(anchor=tk.W)
-        self.log = scrolledtext.ScrolledText(log_frame, width=50, height=8, wrap=tk.WORD)
+        # Read-only (text can still be selected and copied); _drain_log unlocks it per flush
+        self.log = scrolledtext.ScrolledText(log_frame, width=50, height=8, wrap=tk.WORD, state=tk.DISABLED)
         self.log.pack(fill=tk.BOTH, expand=True)
 
         # ====== Startup Tips ======
@@ -389,6 +825,20 @@ class FRPGUI:
         """Handle mouse wheel scrolling (Windows only)"""
         self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
+    def _bind_mousewheel(self, event):
+        """Pointer entered the connection list: route wheel events to it"""
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event):
+        """Pointer left the connection list: stop handling wheel events"""
+        # Moving onto a row inside the canvas also sends <Leave>; keep the binding then.
+        # (Raw Tcl call: the widget under the pointer may have no tkinter wrapper)
+        under = str(self.root.tk.call('winfo', 'containing', event.x_root, event.y_root))
+        canvas = str(self.canvas)
+        if under == canvas or under.startswith(canvas + "."):
+            return
+        self.canvas.unbind_all("<MouseWheel>")
+
     def setup_serial_page(self, parent):
         """Initialize serial mapping tab"""
         serial_group = tk.LabelFrame(parent, text="Serial Settings", padx=10, pady=10)
@@ -409,6 +859,11 @@ class FRPGUI:
         self.baud_combo['values'] = [9600, 19200, 38400, 57600, 115200, 230400]
         self.baud_combo.grid(row=1, column=1, padx=5, pady=(10, 0), sticky=tk.W)
 
+        # Data flow logging (forwarded byte counts; applies to running bridges too)
+        self.trace_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(serial_group, text="Log data flow (byte counts)", variable=self.trace_var,
+                       command=self.apply_trace_setting).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+
         # Public port input
         remote_group = tk.LabelFrame(parent, text="Public Port (1-65535)", padx=10, pady=10)
         remote_group.pack(fill=tk.X, padx=10, pady=5)
@@ -421,6 +876,12 @@ class FRPGUI:
         tk.Button(parent, text="Add & Start Serial Mapping", command=self.add_serial_connection, bg="#4CAF50", fg="white").pack(
             pady=10, padx=10, fill=tk.X)
 
+    def apply_trace_setting(self):
+        """Switch data flow logging on or off for every serial bridge"""
+        for conn in self.connections:
+            if conn.bridge is not None:
+                conn.bridge.verbose = self.trace_var.get()
+
     def setup_tcp_page(self, parent):
         """Initialize TCP mapping tab"""
         ip_group = tk.LabelFrame(parent, text="Internal IP:Port", padx=10, pady=10)
@@ -467,64 +928,115 @@ class FRPGUI:
     def update_tcp_remote_port(self, event=None):
         """
         Auto-suggest public port based on last IP octet + local port.
-        Rule: last_octet + local_port → if >65535, truncate to 5 or 4 digits.
+        Rule: last_octet + local_port (digits appended) → if >65535, truncate to 5 or 4 digits.
         """
         ip_address = self.ip_var.get().strip()
         local_port_str = self.port_var.get().strip()
+        # Key/focus events that did not change either field (arrows, Shift, Tab...) keep the
+        # current suggestion, including any edit the user made to it
+        inputs = (ip_address, local_port_str)
+        if inputs == self.remote_port_inputs:
+            return
+        self.remote_port_inputs = inputs
         self.tcp_remote_entry.delete(0, tk.END)
         if not ip_address or not local_port_str:
             return
-        parts = ip_address.split('.')
-        if len(parts) != 4:
+        if ip_address.count('.') != 3:
             return
+        last_octet_str = ip_address.rpartition('.')[2]
         try:
             local_port_int = int(local_port_str)
-            if not (1 <= local_port_int <= 65535):
-                return
-            last_octet_str = parts[-1]
-            combined_port_str = last_octet_str + local_port_str
-            calculated_port = int(combined_port_str)
-            if calculated_port > 65535:
-                combined_len = len(combined_port_str)
-                if combined_len > 5:
-                    truncated_5_str = combined_port_str[:5]
-                    truncated_5_int = int(truncated_5_str)
-                    if 1 <= truncated_5_int <= 65535:
-                        calculated_port = truncated_5_int
-                    else:
-                        truncated_4_str = combined_port_str[:4]
-                        truncated_4_int = int(truncated_4_str) if truncated_4_str else 0
-                        if 1 <= truncated_4_int <= 65535:
-                            calculated_port = truncated_4_int
-                        else:
-                            return
-                elif combined_len == 5:
-                    truncated_4_str = combined_port_str[:4]
-                    truncated_4_int = int(truncated_4_str) if truncated_4_str else 0
-                    if 1 <= truncated_4_int <= 65535:
-                        calculated_port = truncated_4_int
-                    else:
-                        return
-            if 1 <= calculated_port <= 65535:
-                self.tcp_remote_entry.insert(0, str(calculated_port))
+            last_octet = int(last_octet_str) if last_octet_str else 0
         except ValueError:
-            pass
+            return
+        if not (1 <= local_port_int <= 65535):
+            return
+        calculated_port = last_octet * 10 ** len(local_port_str) + local_port_int
+        if calculated_port > 65535:
+            # Keep the leading 5 (else 4) digits of the appended text; zero padding such as
+            # ".010" counts as digits, exactly as when the joined string was sliced
+            combined_len = len(last_octet_str) + len(local_port_str)
+            for keep in (5, 4):
+                if combined_len > keep:
+                    truncated = calculated_port // 10 ** (combined_len - keep)
+                    if 1 <= truncated <= 65535:
+                        calculated_port = truncated
+                        break
+            else:
+                return
+        if calculated_port >= 1:
+            self.tcp_remote_entry.insert(0, str(calculated_port))
 
     def write_log(self, text):
-        """Thread-safe log writing (use root.after to switch to main thread)"""
-        self.root.after(0, lambda: self._do_write_log(text))
-
-    def _do_write_log(self, text):
-        """Actual log writing (must run in main thread)"""
+        """Thread-safe log writing (queued; flushed by _drain_log in main thread)"""
+        self.log_queue.append(text)
+        # Only the first line of a batch schedules a flush; an idle log costs no timer ticks
+        if not self.log_drain_scheduled:
+            self.log_drain_scheduled = True
+            try:
+                self.root.after(self.LOG_FLUSH_MS, self._drain_log)
+            except (tk.TclError, RuntimeError):
+                pass  # Window already destroyed (stop threads finishing after close)
+
+    def _drain_log(self):
+        """Flush all queued log lines with a single insert (must run in main thread)"""
+        # Clear the flag before draining: a line queued from now on schedules the next flush
+        self.log_drain_scheduled = False
         if not self.root.winfo_exists():
             return
-        self.log.insert(tk.END, text + "\n")
-        self.log.see(tk.END)  # Auto-scroll to bottom
+        queue = self.log_queue
+        lines = []
+        while queue:
+            lines.append(queue.popleft())
+        if lines:
+            text = "\n".join(lines) + "\n"
+            self.log.configure(state=tk.NORMAL)
+            self.log.insert(tk.END, text)
+            self.log_lines += text.count("\n")
+            # Bound memory and redraw cost by dropping the oldest lines
+            if self.log_lines > self.LOG_MAX_LINES:
+                self.log.delete('1.0', f'{self.log_lines - self.LOG_KEEP_LINES + 1}.0')
+                self.log_lines = self.LOG_KEEP_LINES
+            self.log.configure(state=tk.DISABLED)
+            self.log.see(tk.END)  # Auto-scroll to bottom
 
     def refresh_com_ports(self):
-        """Refresh available serial ports"""
-        ports = serial.tools.list_ports.comports()
-        com_list = [p.device for p in ports]
+        """
+        Refresh available serial ports.
+        Enumeration can take tens of milliseconds on Windows, so it runs on a background
+        thread, and a result younger than 2 seconds is reused without rescanning.
+        """
+        scanned_at, com_list = self.ports_cache
+        if time.monotonic() - scanned_at < 2:
+            self._apply_com_ports(com_list)
+            return
+        if self.ports_scan is not None:
+            return  # Scan already in progress
+        self.ports_scan = threading.Thread(target=self._enumerate_ports, daemon=True)
+        self.ports_scan.start()
+        self.root.after(50, self._finish_port_scan)
+
+    def _enumerate_ports(self):
+        """Scan serial ports (run in background thread)"""
+        try:
+            # Imported here so pyserial's enumeration backend loads off the startup path
+            from serial.tools import list_ports
+            com_list = [p.device for p in list_ports.comports()]
+        except Exception as e:
+            self.write_log(f"[WARN] Failed to list serial ports: {e}")
+            return
+        self.ports_cache = (time.monotonic(), com_list)
+
+    def _finish_port_scan(self):
+        """Apply the scan result once the background thread is done (must run in main thread)"""
+        if self.ports_scan.is_alive():
+            self.root.after(50, self._finish_port_scan)
+            return
+        self.ports_scan = None
+        self._apply_com_ports(self.ports_cache[1])
+
+    def _apply_com_ports(self, com_list):
+        """Fill the port combobox"""
         self.com_combo['values'] = com_list
         if com_list:
             self.com_combo.current(0)  # Select first item
@@ -532,17 +1044,11 @@ class FRPGUI:
     def add_serial_connection(self):
         """Handle 'Add Serial Mapping' button click"""
         local_port = self.com_var.get().strip()
-        remote = self.serial_remote_entry.get().strip()
         if not local_port:
             messagebox.showerror("Error", "Please select a serial port")
             return
-        if not remote.isdigit():
-            messagebox.showerror("Error", "Public port must be numeric")
-            return
-        remote_port = int(remote)
-        if not (1 <= remote_port <= 65535):
-            messagebox.showwarning("Warning", f"Public port {remote_port} is out of range (1-65535).")
-            self.write_log(f"[Warning] Failed to add serial mapping: public port {remote_port} invalid.")
+        remote_port = self._read_public_port(self.serial_remote_entry, "serial")
+        if remote_port is None:
             return
         try:
             baud = int(self.baud_var.get())
@@ -553,121 +1059,87 @@ class FRPGUI:
         # Assign local port for serial bridge (avoid conflicts)
         local_port_num = 20000 + (remote_port % 1000)
         bridge = SerialBridge(local_port, baud, local_port_num, self.write_log)
+        bridge.verbose = self.trace_var.get()
         if not bridge.start():
             return
 
-        # Generate FRP config
-        cfg = configparser.ConfigParser()
-        cfg["common"] = {
-            "server_addr": SERVER_ADDR,
-            "server_port": SERVER_PORT,
-            "authentication_method": "token",
-            "token": SERVER_TOKEN
-        }
-        cfg[f"proxy_{remote_port}"] = {
-            "type": "tcp",
-            "local_ip": "127.0.0.1",
-            "local_port": local_port_num,
-            "remote_port": remote_port,
-        }
-
-        # Create temporary config file
-        with tempfile.NamedTemporaryFile(prefix=f"frpc_{remote_port}_", suffix=".ini", delete=False, mode='w',
-                                         encoding='utf-8') as tmpf:
-            cfg.write(tmpf)
-            ini_path = tmpf.name
-
-        # Create connection object
-        conn = FRPConnection("127.0.0.1", local_port_num, remote_port, ini_path, "serial", local_port)
-        conn.baudrate = baud
-        conn.bridge = bridge
-        self.connections.append(conn)
-        self.add_connection_ui(conn)
-        self.start_connection(conn)
+        self._start_frpc("127.0.0.1", local_port_num, remote_port, "serial", local_port,
+                         baudrate=baud, bridge=bridge)
 
     def add_tcp_connection(self):
         """Handle 'Add TCP Mapping' button click"""
         ip = self.ip_var.get().strip()
-        port = self.port_var.get().strip()
-        remote = self.tcp_remote_entry.get().strip()
         if not ip:
             messagebox.showerror("Error", "Please enter IP address")
             return
-        if not port or not port.isdigit():
+        port = _parse_port(self.port_var.get().strip())
+        if port is None:
             messagebox.showerror("Error", "Please enter a valid port number")
             return
-        if not remote or not remote.isdigit():
-            messagebox.showerror("Error", "Public port must be numeric")
-            return
-
-        port = int(port)
-        remote_port = int(remote)
-        if not (1 <= remote_port <= 65535):
-            messagebox.showwarning("Warning", f"Public port {remote_port} is out of range (1-65535).")
-            self.write_log(f"[Warning] Failed to add TCP mapping: public port {remote_port} invalid.")
-            return
-
-        # Generate FRP config
-        cfg = configparser.ConfigParser()
-        cfg["common"] = {
-            "server_addr": SERVER_ADDR,
-            "server_port": SERVER_PORT,
-            "authentication_method": "token",
-            "token": SERVER_TOKEN
-        }
-        cfg[f"proxy_{remote_port}"] = {
-            "type": "tcp",
-            "local_ip": ip,
-            "local_port": port,
-            "remote_port": remote_port,
-        }
-
-        # Create temporary config file
-        with tempfile.NamedTemporaryFile(prefix=f"frpc_{remote_port}_", suffix=".ini", delete=False, mode='w',
-                                         encoding='utf-8') as tmpf:
-            cfg.write(tmpf)
-            ini_path = tmpf.name
+        remote_port = self._read_public_port(self.tcp_remote_entry, "TCP")
+        if remote_port is None:
+            return
+
+        self._start_frpc(ip, port, remote_port, "tcp")
+
+    def _read_public_port(self, entry, mapping_name):
+        """Validate a public port entry; report the problem and return None if invalid"""
+        remote = entry.get().strip()
+        remote_port = _parse_port(remote)
+        if remote_port is None:
+            messagebox.showerror("Error", f"Public port must be a number between 1 and 65535 (got '{remote}').")
+            self.write_log(f"[Warning] Failed to add {mapping_name} mapping: public port '{remote}' invalid.")
+        return remote_port
+
+    def _start_frpc(self, local_ip, local_port, remote_port, conn_type, serial_port=None,
+                    baudrate=None, bridge=None):
+        """Write the temporary FRP config, add the connection row and start frpc"""
+        ini_path = _emit_frpc_ini(local_ip, local_port, remote_port)
 
         # Create connection object
-        conn = FRPConnection(ip, port, remote_port, ini_path, "tcp")
-        self.connections.append(conn)
+        conn = FRPConnection(local_ip, local_port, remote_port, ini_path, conn_type, serial_port)
+        conn.baudrate = baudrate
+        conn.bridge = bridge
+        self.connections[conn] = None
         self.add_connection_ui(conn)
         self.start_connection(conn)
 
-    def bind_status_label(self, label, remote_port):
+    def bind_status_label(self, label, conn):
         """
-        Bind interactive behavior to "[Running]" label:
+        Bind interactive behavior to the status label (once, when the row is created).
+        While the connection is running ("[Running]"):
           - Hover: underline
           - Click: copy public address to clipboard, show "[Copied!]"
         """
-        # Get current font
-        current_font = label.cget("font")
-        import tkinter.font as tkFont
-        if isinstance(current_font, str):
-            font_obj = tkFont.Font(font=current_font)
-        else:
-            font_obj = tkFont.Font(font=current_font)
-
-        normal_font = font_obj.copy()
-        underline_font = font_obj.copy()
-        underline_font.configure(underline=True)
+        normal_font = self.status_font
+        underline_font = self.status_font_underline
 
         def on_enter(e):
-            label.config(font=underline_font)
+            if conn.status == "Running":
+                label.config(font=underline_font)
 
         def on_leave(e):
             label.config(font=normal_font)
 
+        def restore():
+            # Skip if the connection stopped meanwhile; refresh_status already shows that
+            if conn.status == "Running":
+                conn.status_var.set("[Running]")
+                label.config(fg="blue", font=normal_font)
+
         def on_click(e):
+            if conn.status != "Running":
+                return
             # Determine public host
             host = "www.esun21.com" if SERVER_ADDR == DEFAULT_FRP_CONFIG['addr'] else SERVER_ADDR
-            address = f"{host}:{remote_port}"
+            address = f"{host}:{conn.remote_port}"
             self.root.clipboard_clear()
             self.root.clipboard_append(address)
             self.write_log(f"[INFO] Copied address: {address}")
             # Temporarily show green "[Copied!]"
-            label.config(text="[Copied!]", fg="green", font=normal_font)
-            label.after(1000, lambda: label.config(text="[Running]", fg="blue", font=normal_font))
+            conn.status_var.set("[Copied!]")
+            label.config(fg="green", font=normal_font)
+            label.after(1000, restore)
 
         label.bind("<Enter>", on_enter)
         label.bind("<Leave>", on_leave)
@@ -687,25 +1159,25 @@ class FRPGUI:
         prefix_lbl = tk.Label(frame, text=prefix_text, anchor="w")
         prefix_lbl.pack(side=tk.LEFT)
 
-        status_text = f"[{conn.status}]"
+        conn.status_var = tk.StringVar(frame, value=f"[{conn.status}]")
         status_lbl = tk.Label(
             frame,
-            text=status_text,
+            textvariable=conn.status_var,
             anchor="w",
             fg="blue" if conn.status == "Running" else "gray",
             cursor="hand2" if conn.status == "Running" else ""
         )
         status_lbl.pack(side=tk.LEFT)
 
-        # Bind interaction (only if running)
-        if conn.status == "Running":
-            self.bind_status_label(status_lbl, conn.remote_port)
+        # Bind interaction (handlers only act while running)
+        self.bind_status_label(status_lbl, conn)
 
         # Button area
         button_frame = tk.Frame(frame)
         button_frame.pack(side=tk.RIGHT, fill=tk.Y)
 
-        btn_toggle = tk.Button(button_frame, text="Stop" if conn.status == "Running" else "Start", width=5,
+        conn.toggle_var = tk.StringVar(frame, value="Stop" if conn.status == "Running" else "Start")
+        btn_toggle = tk.Button(button_frame, textvariable=conn.toggle_var, width=5,
                                command=lambda c=conn: self.toggle_connection(c))
         btn_remove = tk.Button(button_frame, text="Remove", width=7,
                                command=lambda c=conn: self.remove_connection(c))
@@ -716,34 +1188,48 @@ class FRPGUI:
 
         # Save UI references
         conn.frame = (frame, prefix_lbl, status_lbl)
+        conn.shown_status = conn.status
 
     def refresh_status(self, conn):
         """Refresh connection UI status (thread-safe)"""
         if not hasattr(conn, 'frame') or not conn.frame:
             return
 
+        # Nothing to do if this status is already on screen
+        if conn.shown_status == conn.status:
+            return
+
         frame, prefix_lbl, status_lbl = conn.frame
         if not (frame.winfo_exists() and prefix_lbl.winfo_exists() and status_lbl.winfo_exists()):
             return
+        conn.shown_status = conn.status
 
-        status_text = f"[{conn.status}]"
+        # Event handlers are bound once in add_connection_ui and check conn.status themselves
+        conn.status_var.set(f"[{conn.status}]")
         if conn.status == "Running":
-            status_lbl.config(text=status_text, fg="blue", cursor="hand2")
-            # Rebind events (prevent multiple bindings)
-            status_lbl.unbind("<Enter>")
-            status_lbl.unbind("<Leave>")
-            status_lbl.unbind("<Button-1>")
-            self.bind_status_label(status_lbl, conn.remote_port)
+            status_lbl.config(fg="blue", cursor="hand2")
+            conn.toggle_var.set("Stop")
         else:
-            status_lbl.config(text=status_text, fg="gray", cursor="")
-            status_lbl.unbind("<Enter>")
-            status_lbl.unbind("<Leave>")
-            status_lbl.unbind("<Button-1>")
-
-        # Update button text
-        btn_toggle = conn.buttons.get('toggle')
-        if btn_toggle and btn_toggle.winfo_exists():
-            btn_toggle.config(text="Stop" if conn.status == "Running" else "Start")
+            status_lbl.config(fg="gray", cursor="", font=self.status_font)
+            conn.toggle_var.set("Start")
+
+    def _schedule_refresh(self, conn):
+        """Queue a status row refresh from a worker thread; one Tk callback serves a whole burst"""
+        with self.refresh_lock:
+            first = not self.pending_refresh
+            self.pending_refresh.add(conn)
+        if first:
+            try:
+                self.root.after(0, self._flush_refresh)
+            except (tk.TclError, RuntimeError):
+                pass  # Window already destroyed
+
+    def _flush_refresh(self):
+        """Refresh every queued status row (must run in main thread)"""
+        with self.refresh_lock:
+            conns, self.pending_refresh = self.pending_refresh, set()
+        for conn in conns:
+            self.refresh_status(conn)
 
     def toggle_connection(self, conn):
         """Toggle connection state (start/stop)"""
@@ -757,50 +1243,49 @@ class FRPGUI:
         if conn.status == "Running":
             self.write_log(f"[Info] {conn.remote_port} already running")
             return
-        if not os.path.exists(FRPC_EXEC):
-            messagebox.showerror("Error", f"Cannot find {FRPC_EXEC}")
-            return
+        if not self.frpc_exec_verified:
+            if not os.path.exists(FRPC_EXEC):
+                messagebox.showerror("Error", f"Cannot find {FRPC_EXEC}")
+                return
+            self.frpc_exec_verified = True
 
-        # For serial, rebuild bridge
+        # For serial, make sure the bridge is running
         if conn.conn_type == "serial":
             if not hasattr(conn, 'baudrate') or conn.baudrate is None:
                 messagebox.showerror("Error", "Missing baud rate for serial connection")
                 return
 
-            # Stop old bridge if exists
-            if getattr(conn, 'bridge', None) and conn.bridge.running:
-                self.write_log(f"[INFO] Stopping old serial bridge...")
-                conn.bridge.stop()
-
-            local_port_num = 20000 + (conn.remote_port % 1000)
-            bridge = SerialBridge(conn.serial_port, conn.baudrate, local_port_num, self.write_log)
-            if not bridge.start():
-                return
-            conn.bridge = bridge
-            conn.local_port = local_port_num
+            if conn.bridge is not None and conn.bridge.server is not None:
+                # Reuse the bridge and its bound listener (just started by add, or paused by stop)
+                if not conn.bridge.resume():
+                    return
+            else:
+                local_port_num = 20000 + (conn.remote_port % 1000)
+                bridge = SerialBridge(conn.serial_port, conn.baudrate, local_port_num, self.write_log)
+                bridge.verbose = self.trace_var.get()
+                if not bridge.start():
+                    return
+                conn.bridge = bridge
+                conn.local_port = local_port_num
 
         # Start frpc subprocess
         try:
             self.write_log(f"[Starting] {conn.remote_port}")
-            startupinfo = None
-            if os.name == 'nt':
-                # Hide console window on Windows
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-            with conn.process_lock:
-                conn.process = subprocess.Popen(
-                    [FRPC_EXEC, "-c", conn.ini_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    startupinfo=startupinfo
-                )
-            # Start log reading thread
-            threading.Thread(target=self.read_output, args=(conn,), daemon=True).start()
+            startupinfo = _hidden_window_startupinfo()
+            # Raw, unbuffered pipe: output is read in bulk with os.read and split into lines here
+            conn.process = subprocess.Popen(
+                [FRPC_EXEC, "-c", conn.ini_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                startupinfo=startupinfo
+            )
+            # Forward frpc output to the log
+            self._watch_output(conn)
             conn.status = "Running"
             self.refresh_status(conn)
         except FileNotFoundError:
+            self.frpc_exec_verified = False
             messagebox.showerror("Error", f"Cannot find {FRPC_EXEC}, please check path.")
             self.write_log(f"[Error] Failed to start {conn.remote_port}: {FRPC_EXEC} not found")
         except Exception as e:
@@ -808,27 +1293,34 @@ class FRPGUI:
             self.write_log(f"[Error] Failed to start {conn.remote_port}: {str(e)}")
 
     def stop_connection(self, conn):
-        """Stop connection (asynchronously)"""
+        """Stop connection (asynchronously); returns the Future of the reap, or None"""
         if conn.status == "Stopped":
             self.write_log(f"[Info] {conn.remote_port} already stopped")
-            return
-        threading.Thread(target=self._do_stop_connection, args=(conn,), daemon=True).start()
-
-    def _do_stop_connection(self, conn):
-        """Actual stop logic (run in background thread)"""
-        # Stop serial bridge if exists
-        if getattr(conn, 'bridge', None):
-            conn.bridge.stop()
-            conn.bridge = None
-
-        # Terminate frpc process
+            return None
+        self._signal_stop(conn)
+        return self.stop_pool.submit(self._reap, conn, time.monotonic() + 5)
+
+    def _signal_stop(self, conn):
+        """Ask frpc to exit without waiting for it (cheap enough for the main thread)"""
+        process = conn.process
+        if process is not None:
+            try:
+                process.terminate()
+            except OSError:
+                pass  # Already exited
+
+    def _reap(self, conn, deadline):
+        """Wait for a signalled connection to stop, killing frpc if it outlives deadline (stop pool)"""
+        # Release the serial port; the bridge's listener stays bound for a restart
+        bridge = conn.bridge  # Read once: a concurrent _release may clear it
+        if bridge is not None:
+            bridge.pause()
+
+        # Wait for frpc to exit
         with conn.process_lock:
             process = conn.process
             if process is not None:
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                if not _wait_process(process, max(0.0, deadline - time.monotonic())):
                     self.write_log(f"[WARN] {conn.remote_port} did not respond to terminate, forcing kill")
                     process.kill()
                     process.wait()
@@ -836,85 +1328,234 @@ class FRPGUI:
 
         conn.status = "Stopped"
         # Switch back to main thread to refresh UI
-        self.root.after(0, lambda: self.refresh_status(conn))
+        self._schedule_refresh(conn)
+        # frpc has exited, so a retired connection's resources can go now (concurrently with other stops)
+        if conn.retired:
+            self._release(conn)
+
+        # While closing, the last connection to stop finishes the shutdown
+        with self.stop_lock:
+            if not self.closing:
+                return
+            self.pending_stops.discard(conn)
+            all_stopped = not self.pending_stops
+        if all_stopped:
+            self.root.after(0, self._finalize_close)
 
     def remove_connection(self, conn):
         """Remove connection (stop first, then delete UI)"""
-        self.stop_connection(conn)
-        if conn in self.connections:
-            self.connections.remove(conn)
+        conn.retired = True
+        if self.stop_connection(conn) is None:
+            # Already stopped: nothing will reap it, so release it here
+            self.stop_pool.submit(self._release, conn)
+        self.connections.pop(conn, None)
         if hasattr(conn, 'frame') and conn.frame:
             frame, _, _ = conn.frame
             if frame.winfo_exists():
-                frame.destroy()
-            # Update scroll region
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+                # Hide the row now; destroy it with any other removed rows on the next idle turn
+                frame.pack_forget()
+                if not self.pending_destroy:
+                    self.root.after_idle(self._flush_destroys)
+                self.pending_destroy.append(frame)
+
+    def _flush_destroys(self):
+        """Destroy all rows removed since the last idle turn, then fit the scroll region once"""
+        frames, self.pending_destroy = self.pending_destroy, []
+        for frame in frames:
+            frame.destroy()
+        self._request_scrollregion_update()
+
+    def _request_scrollregion_update(self):
+        """Queue one scroll region update for the next idle turn (coalesces bulk adds/removes)"""
+        if self.scrollregion_pending:
+            return
+        self.scrollregion_pending = True
+        self.root.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        """Fit the canvas scroll region to its contents (must run in main thread)"""
+        self.scrollregion_pending = False
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def _watch_output(self, conn):
+        """
+        Start forwarding a freshly started frpc's output to the log.
+        On POSIX every stdout pipe is registered with one shared selector, drained by a
+        single thread; Windows pipes cannot be selected, so each process gets a reader thread.
+        """
+        if os.name == 'nt':
+            threading.Thread(target=self.read_output, args=(conn,), daemon=True).start()
+            return
+        if self.output_selector is None:
+            self.output_selector = selectors.DefaultSelector()
+            threading.Thread(target=self._pump_output, daemon=True).start()
+        process = conn.process
+        fd = process.stdout.fileno()
+        os.set_blocking(fd, False)
+        conn.output_tail = b""
+        self.output_selector.register(fd, selectors.EVENT_READ, (conn, process))
+
+    def _pump_output(self):
+        """Drain output of all running frpc processes (single background thread, POSIX)"""
+        sel = self.output_selector
+        while True:
+            # Timeout is only a safety net; epoll/kqueue also report fds registered mid-wait
+            for key, _ in sel.select(timeout=0.5):
+                conn, process = key.data
+                # This thread serves every connection: an error is logged and confined to
+                # its own connection, so the other pipes keep being drained
+                try:
+                    self._pump_output_key(sel, key, conn, process)
+                except Exception as e:
+                    self.write_log(f"[ERROR] Exception handling output for {conn.remote_port}: {e}")
+
+    def _pump_output_key(self, sel, key, conn, process):
+        """Handle one readable frpc stdout pipe for _pump_output"""
+        try:
+            chunk = os.read(key.fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.write_log(f"[ERROR] Exception reading output for {conn.remote_port}: {e}")
+            chunk = b""
+        if chunk:
+            self._feed_output(conn, chunk)
+            return
+        # EOF: frpc exited (or closed its output). Unregister first, so a failure
+        # below cannot leave an fd that reports EOF on every select
+        sel.unregister(key.fd)
+        self._flush_output_tail(conn)
+        process.stdout.close()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        self._output_finished(conn, process)
 
     def read_output(self, conn):
-        """Read frpc subprocess output and log it"""
-        with conn.process_lock:
-            process = conn.process
-            if process is None:
-                return
+        """Read frpc subprocess output and log it (one thread per process, Windows)"""
+        # A single reference load is atomic; only stopping needs process_lock
+        process = conn.process
+        if process is None:
+            return
+        fd = process.stdout.fileno()
+        conn.output_tail = b""
         try:
-            for line in iter(process.stdout.readline, ''):
-                if not line:
-                    continue
-                stripped_line = line.rstrip()
-                self.write_log(f"[{conn.remote_port}] {stripped_line}")
-                # Detect port conflict
-                if "start error: proxy [" in stripped_line and "] already exists" in stripped_line:
-                    self.root.after(0, lambda c=conn: self.handle_proxy_already_exists(c))
+            # Blocking bulk reads: one call per burst of output rather than one per line
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                self._feed_output(conn, chunk)
+            self._flush_output_tail(conn)
+            process.stdout.close()
             process.wait()
         except Exception as e:
             self.write_log(f"[ERROR] Exception reading output for {conn.remote_port}: {e}")
-        # Update status after process ends
-        with conn.process_lock:
-            if conn.process is not None and conn.process.poll() is not None:
-                conn.status = "Stopped"
-                self.root.after(0, lambda: self.refresh_status(conn))
+        self._output_finished(conn, process)
+
+    def _feed_output(self, conn, chunk):
+        """Log the complete lines in a chunk of frpc output; keep the unterminated remainder"""
+        *lines, conn.output_tail = (conn.output_tail + chunk).split(b"\n")
+        for line in lines:
+            self._handle_output_line(conn, line)
+
+    def _flush_output_tail(self, conn):
+        """Log any final unterminated line once frpc's output has ended"""
+        if conn.output_tail:
+            self._handle_output_line(conn, conn.output_tail)
+            conn.output_tail = b""
+
+    def _handle_output_line(self, conn, line):
+        """Log one raw line of frpc output and react to port conflicts"""
+        self.write_log(f"[{conn.remote_port}] {line.decode('utf-8', errors='replace').rstrip()}")
+        # Detect port conflict (on the bytes, no second pass over the decoded text)
+        if _PROXY_EXISTS_RE.search(line):
+            try:
+                self.root.after(0, self.handle_proxy_already_exists, conn)
+            except (tk.TclError, RuntimeError):
+                pass  # Window already destroyed
+
+    def _output_finished(self, conn, process):
+        """Update status once frpc's output has ended, if it exited on its own"""
+        # Compare against the current process: the connection may already be stopped or restarted
+        if conn.process is process and process.poll() is not None:
+            conn.status = "Stopped"
+            self._schedule_refresh(conn)
 
     def on_close(self):
         """Handle main window close event"""
-        if self.closing:
-            return
-        self.closing = True
-        self.close_start_time = time.time()
+        with self.stop_lock:
+            if self.closing:
+                return
+            self.closing = True
+            # Each stop thread removes its connection; the last one triggers _finalize_close
+            self.pending_stops = {conn for conn in self.connections if conn.status != "Stopped"}
+            stopping = list(self.pending_stops)
         self.write_log("[INFO] Closing all connections, please wait...")
 
-        # Stop all connections
-        for conn in self.connections[:]:
-            self.stop_connection(conn)
+        # Bridges and temp configs are released off the UI thread: by _reap once each frpc
+        # has exited, or right away for connections that are already stopped
+        for conn in self.connections:
+            conn.retired = True
+            if conn not in self.pending_stops:
+                self.stop_pool.submit(self._release, conn)
 
-        # Begin checking if all stopped
-        self.check_all_stopped()
+        # Single hard deadline instead of re-checking on a timer
+        self.close_timeout_id = self.root.after(10000, self._force_exit)
 
-    def check_all_stopped(self):
-        """Check if all connections are stopped; force exit on timeout"""
-        if time.time() - self.close_start_time > 10:
-            self.write_log("[WARN] Close timeout, forcing exit")
-            self.root.destroy()
+        if not stopping:
+            self._finalize_close()
             return
 
-        all_stopped = True
-        for conn in self.connections:
-            if conn.status != "Stopped":
-                all_stopped = False
-                break
+        # Signal every frpc first so they all exit in parallel, then reap them under one
+        # shared deadline (directly, so every pending connection reports back even if
+        # its frpc exits on its own in the meantime)
+        for conn in stopping:
+            self._signal_stop(conn)
+        deadline = time.monotonic() + 5
+        for conn in stopping:
+            self.stop_pool.submit(self._reap, conn, deadline)
+
+    def _release(self, conn):
+        """Free what a stopped, retired connection still holds (stop pool)"""
+        # on_close can release a connection whose _reap is still finishing: only one of
+        # them takes the bridge (the temp config delete already tolerates a second call)
+        with conn.process_lock:
+            bridge, conn.bridge = conn.bridge, None
+        if bridge is not None:
+            bridge.stop()
+        self._discard_ini(conn)
+
+    def _discard_ini(self, conn):
+        """Delete a connection's temporary frpc config (stop pool)"""
+        if not conn.is_temp_ini:
+            return
+        try:
+            os.remove(conn.ini_path)
+            self.write_log(f"[INFO] Deleted temp config: {conn.ini_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.write_log(f"[WARN] Failed to delete temp config {conn.ini_path}: {e}")
 
-        if all_stopped:
-            # Clean up temporary config files
-            for conn in self.connections[:]:
-                try:
-                    if os.path.exists(conn.ini_path):
-                        os.remove(conn.ini_path)
-                        self.write_log(f"[INFO] Deleted temp config: {conn.ini_path}")
-                except Exception as e:
-                    self.write_log(f"[WARN] Failed to delete temp config {conn.ini_path}: {e}")
-            self.root.destroy()
-        else:
-            # Check again in 200ms
-            self.root.after(200, self.check_all_stopped)
+    def _finalize_close(self):
+        """All connections stopped (temp configs already deleted by the stop pool): close the window"""
+        if self.close_finished:
+            return
+        self.close_finished = True
+        self.root.after_cancel(self.close_timeout_id)
+        # Queued config deletions still finish; the pool's threads are joined at interpreter exit
+        self.stop_pool.shutdown(wait=False)
+        self.root.destroy()
+
+    def _force_exit(self):
+        """Close timeout reached: exit even though some connections have not stopped"""
+        if self.close_finished:
+            return
+        self.close_finished = True
+        self.write_log("[WARN] Close timeout, forcing exit")
+        self.root.destroy()
 
     def handle_proxy_already_exists(self, conn):
         """Handle FRP port conflict"""
@@ -923,12 +1564,11 @@ class FRPGUI:
 
     def show_about(self):
         """Show About dialog"""
-        notes = "\n".join(UPDATE_NOTES)
         messagebox.showinfo(
             f"Version {APP_VERSION}",
             f"Author: Frank.Ni\n"
             f"Website: www.esun21.com\n\n"
-            f"[Recent Updates]\n{notes}"
+            f"[Recent Updates]\n{_ABOUT_NOTES}"
         )
 
 
@@ -966,7 +1606,7 @@ if __name__ == "__main__":
         root.lift()
         root.focus_force()
         root.attributes('-topmost', True)
-        root.after(150, lambda: root.attributes('-topmost', False))
+        root.after(150, root.attributes, '-topmost', False)
 
     root.deiconify()  # Show window now
     root.after(100, bring_to_front)